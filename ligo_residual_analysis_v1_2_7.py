@@ -13,22 +13,22 @@ Fixes from v1.2.6:
 
 from __future__ import annotations
 
+import mmap
+import os
 import sys
 import platform
+import functools
 import hashlib
 import json
-import datetime
+import time
 from typing import Any, Dict, Tuple
 
 import numpy as np
-import scipy
-import gwpy
 
-# Optional dependency: LALSuite (not required for strict archival logic)
-try:
-    import lal  # type: ignore
-except ImportError:  # pragma: no cover
-    lal = None
+# scipy / gwpy / lal are imported lazily on first use (see
+# _load_heavy_versions / _load_lal_version): importing this module for
+# its constants or preregistration helpers must not pay their
+# multi-hundred-ms import cost.
 
 # ------------------------------------------------------------------
 # ARCHIVAL RIGOR CONTROLS
@@ -43,6 +43,20 @@ PINNED_VERSIONS = {
     "scipy": "1.13.1",
 }
 
+# Intern the pins so matching runtime versions (interned on load) hit
+# the identity fast path before falling back to a character compare.
+PINNED_VERSIONS = {k: sys.intern(v) for k, v in PINNED_VERSIONS.items()}
+
+# Process-invariant python-version strings, computed once at import.
+_PY_ACTUAL_MM = f"{sys.version_info.major}.{sys.version_info.minor}"
+_PY_ACTUAL_FULL = f"{_PY_ACTUAL_MM}.{sys.version_info.micro}"
+_PY_EXPECTED_MM = PINNED_VERSIONS["python"].rsplit(".", 1)[0]
+
+# Likewise invariant host identifiers (platform.machine() shells out to
+# uname-level lookups on first call; resolve it once here).
+_OS_NAME = sys.platform
+_ARCH = platform.machine()
+
 # ------------------------------------------------------------------
 # PREREGISTRATION COMMITMENT (BINDING)
 # ------------------------------------------------------------------
@@ -50,7 +64,11 @@ PINNED_VERSIONS = {
 # It is immutable and compared byte-for-byte to current config.
 PREREG_DATE = "2025-12-18"
 PREREG_PAYLOAD_LITERAL = '{"ctrl":[1.5,1.6],"echo":[0.95,1.05]}'
-PREREG_HASH16 = hashlib.sha256(PREREG_PAYLOAD_LITERAL.encode("utf-8")).hexdigest()[:16]
+_PREREG_PAYLOAD_BYTES = PREREG_PAYLOAD_LITERAL.encode("utf-8")
+PREREG_HASH16 = hashlib.sha256(_PREREG_PAYLOAD_BYTES).hexdigest()[:16]
+# hash16 is exactly the first 8 digest bytes in hex; keep the raw form
+# so the binding check is an 8-byte compare instead of hex slicing.
+_PREREG_DIGEST8 = bytes.fromhex(PREREG_HASH16)
 
 ECHO_WINDOW = (0.95, 1.05)
 CONTROL_WINDOW = (1.50, 1.60)
@@ -65,17 +83,64 @@ WHITEN_WINDOW = "hann"
 # ------------------------------------------------------------------
 # GLOBAL STATE (RESETTABLE)
 # ------------------------------------------------------------------
-CODE_SHA256 = "unknown"
+CODE_HASH = "unknown"
+CODE_HASH_ALGORITHM = "blake2b-256"
 CODE_SOURCE_MODE = "unknown"  # file | interactive | error
-_WHITEN_MODES_SEEN = set()
+
+# Whitening modes seen, tracked as a two-bit mask (cheaper than a set
+# on the hot path). Name table is kept in sorted order so the record
+# field stays byte-identical to the previous sorted-set output.
+_MODE_PINNED_KWARGS = 1
+_MODE_ASD_ONLY_FALLBACK = 2
+_WHITEN_MODE_NAMES = (
+    (_MODE_ASD_ONLY_FALLBACK, "asd_only_fallback"),
+    (_MODE_PINNED_KWARGS, "pinned_kwargs"),
+)
+_WHITEN_MODES_MASK = 0
 _WHITEN_FALLBACK_REASON = None
 _WHITEN_FALLBACK_LOGGED = False
 
 
+def _whiten_modes_list() -> list:
+    """Mode names for the run record, in sorted (table) order."""
+    return [name for bit, name in _WHITEN_MODE_NAMES if _WHITEN_MODES_MASK & bit]
+
+# Lazily resolved dependency versions (cached after first import).
+_SCIPY_VER = None
+_GWPY_VER = None
+_LAL_VER = None
+_LAL_CHECKED = False
+
+
+def _load_heavy_versions() -> Tuple[str, str]:
+    """Import scipy/gwpy on first use; cache and return their versions."""
+    global _SCIPY_VER, _GWPY_VER
+    if _SCIPY_VER is None:
+        import scipy
+        import gwpy
+        _SCIPY_VER = sys.intern(scipy.__version__)
+        _GWPY_VER = sys.intern(gwpy.__version__)
+    return _SCIPY_VER, _GWPY_VER
+
+
+def _load_lal_version() -> Any:
+    """Import optional LALSuite on first use; cache its version (or None)."""
+    global _LAL_VER, _LAL_CHECKED
+    if not _LAL_CHECKED:
+        # Optional dependency: LALSuite (not required for strict archival logic)
+        try:
+            import lal  # type: ignore
+            _LAL_VER = getattr(lal, "__version__", None)
+        except ImportError:  # pragma: no cover
+            _LAL_VER = None
+        _LAL_CHECKED = True
+    return _LAL_VER
+
+
 def reset_runtime_state() -> None:
     """Ensure repeated executions in the same interpreter do not accumulate state."""
-    global _WHITEN_MODES_SEEN, _WHITEN_FALLBACK_REASON, _WHITEN_FALLBACK_LOGGED
-    _WHITEN_MODES_SEEN = set()
+    global _WHITEN_MODES_MASK, _WHITEN_FALLBACK_REASON, _WHITEN_FALLBACK_LOGGED
+    _WHITEN_MODES_MASK = 0
     _WHITEN_FALLBACK_REASON = None
     _WHITEN_FALLBACK_LOGGED = False
 
@@ -88,16 +153,27 @@ def get_code_hash_best_effort() -> Tuple[str, str]:
     """Import-safe best-effort code hash. Never raises."""
     try:
         if "__file__" in globals():
-            with open(__file__, "rb") as f:
-                return hashlib.sha256(f.read()).hexdigest(), "file"
+            with open(__file__, "rb", buffering=0) as f:
+                # BLAKE2b-256: same 256-bit strength as SHA-256 but
+                # faster per byte in pure software, and code identity
+                # is not part of the preregistration commitment (which
+                # stays SHA-256). Hash straight from the page cache via
+                # mmap (no user-space read copies); fall back to
+                # streaming if the file cannot be mapped.
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        return hashlib.blake2b(mm, digest_size=32).hexdigest(), "file"
+                except (ValueError, OSError):  # pragma: no cover
+                    digest = hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=32))
+                    return digest.hexdigest(), "file"
         return "interactive", "interactive"
     except Exception as e:  # pragma: no cover
         return f"error:{e}", "error"
 
 
 def refresh_code_identity() -> None:
-    global CODE_SHA256, CODE_SOURCE_MODE
-    CODE_SHA256, CODE_SOURCE_MODE = get_code_hash_best_effort()
+    global CODE_HASH, CODE_SOURCE_MODE
+    CODE_HASH, CODE_SOURCE_MODE = get_code_hash_best_effort()
 
 
 # ------------------------------------------------------------------
@@ -112,29 +188,48 @@ def enforce_file_based_execution() -> None:
         )
 
 
+# Key of the last successful enforce_dependency_versions() pass. The
+# runtime versions cannot change in-process, but the pins (and code
+# identity) can be rebound — e.g. by tests — so cache success keyed on
+# them: any mutation busts the cache and forces a full re-check.
+# Failures are never cached.
+_DEPS_VERIFIED_KEY = None
+
+
+def _deps_cache_key() -> Tuple[Any, ...]:
+    return (CODE_HASH, tuple(sorted(PINNED_VERSIONS.items())))
+
+
 def enforce_dependency_versions() -> None:
+    global _DEPS_VERIFIED_KEY
+
     if not STRICT_ARCHIVAL:
         return
 
-    mismatches = []
+    cache_key = _deps_cache_key()
+    if cache_key == _DEPS_VERIFIED_KEY:
+        return
 
-    python_version = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
-    expected_mm = ".".join(PINNED_VERSIONS["python"].split(".")[:2])
-    actual_mm = f"{sys.version_info.major}.{sys.version_info.minor}"
+    mismatches = []
 
-    if actual_mm != expected_mm:
+    if _PY_ACTUAL_MM != _PY_EXPECTED_MM:
         mismatches.append(
-            f"python: expected {expected_mm}.* (reference {PINNED_VERSIONS['python']}), got {python_version}"
+            f"python: expected {_PY_EXPECTED_MM}.* (reference {PINNED_VERSIONS['python']}), got {_PY_ACTUAL_FULL}"
         )
 
-    if gwpy.__version__ != PINNED_VERSIONS["gwpy"]:
-        mismatches.append(f"gwpy: expected {PINNED_VERSIONS['gwpy']}, got {gwpy.__version__}")
+    scipy_ver, gwpy_ver = _load_heavy_versions()
+
+    pin = PINNED_VERSIONS["gwpy"]
+    if gwpy_ver is not pin and gwpy_ver != pin:
+        mismatches.append(f"gwpy: expected {pin}, got {gwpy_ver}")
 
-    if np.__version__ != PINNED_VERSIONS["numpy"]:
-        mismatches.append(f"numpy: expected {PINNED_VERSIONS['numpy']}, got {np.__version__}")
+    pin = PINNED_VERSIONS["numpy"]
+    if np.__version__ is not pin and np.__version__ != pin:
+        mismatches.append(f"numpy: expected {pin}, got {np.__version__}")
 
-    if scipy.__version__ != PINNED_VERSIONS["scipy"]:
-        mismatches.append(f"scipy: expected {PINNED_VERSIONS['scipy']}, got {scipy.__version__}")
+    pin = PINNED_VERSIONS["scipy"]
+    if scipy_ver is not pin and scipy_ver != pin:
+        mismatches.append(f"scipy: expected {pin}, got {scipy_ver}")
 
     if mismatches:
         raise RuntimeError(
@@ -142,6 +237,34 @@ def enforce_dependency_versions() -> None:
             + "\n".join(f"  - {m}" for m in mismatches)
         )
 
+    _DEPS_VERIFIED_KEY = cache_key
+
+
+@functools.lru_cache(maxsize=4)
+def _canonical_payload(ctrl: Tuple[float, float], echo: Tuple[float, float]) -> Tuple[bytes, bytes, str]:
+    """Canonical payload bytes, raw 8-byte digest prefix, and hash16.
+
+    Cached: the windows are module constants, so repeated verification
+    (one call per run record) reuses the serialization and digest, and
+    the binding checks reduce to raw bytes compares.
+    """
+    payload = json.dumps(
+        {
+            "ctrl": [float(ctrl[0]), float(ctrl[1])],
+            "echo": [float(echo[0]), float(echo[1])],
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    digest8 = hashlib.sha256(payload).digest()[:8]
+    return payload, digest8, digest8.hex()
+
+
+# Last verification result, keyed by window-object identity so the hot
+# path skips even the lru_cache key hashing when the globals have not
+# been rebound. Rebinding either window tuple invalidates it.
+_VERIFY_FAST_PATH = None  # (ctrl, echo, payload_bytes, digest8, hash16)
+
 
 def verify_window_preregistration() -> str:
     """
@@ -150,25 +273,23 @@ def verify_window_preregistration() -> str:
     - Requires exact equality with PREREG_PAYLOAD_LITERAL.
     - Also checks hash16 matches the embedded commitment.
     """
-    current_payload = json.dumps(
-        {
-            "ctrl": [float(CONTROL_WINDOW[0]), float(CONTROL_WINDOW[1])],
-            "echo": [float(ECHO_WINDOW[0]), float(ECHO_WINDOW[1])],
-        },
-        sort_keys=True,
-        separators=(",", ":"),
-    )
+    global _VERIFY_FAST_PATH
 
-    if STRICT_ARCHIVAL and current_payload != PREREG_PAYLOAD_LITERAL:
+    cached = _VERIFY_FAST_PATH
+    if cached is not None and cached[0] is CONTROL_WINDOW and cached[1] is ECHO_WINDOW:
+        current_payload, computed_digest8, computed_hash16 = cached[2], cached[3], cached[4]
+    else:
+        current_payload, computed_digest8, computed_hash16 = _canonical_payload(CONTROL_WINDOW, ECHO_WINDOW)
+        _VERIFY_FAST_PATH = (CONTROL_WINDOW, ECHO_WINDOW, current_payload, computed_digest8, computed_hash16)
+
+    if STRICT_ARCHIVAL and current_payload != _PREREG_PAYLOAD_BYTES:
         raise RuntimeError(
             "STRICT_ARCHIVAL: Window preregistration mismatch!\n"
             f"Expected literal payload: {PREREG_PAYLOAD_LITERAL}\n"
-            f"Computed current payload:  {current_payload}"
+            f"Computed current payload:  {current_payload.decode('utf-8')}"
         )
 
-    computed_hash16 = hashlib.sha256(current_payload.encode("utf-8")).hexdigest()[:16]
-
-    if STRICT_ARCHIVAL and computed_hash16 != PREREG_HASH16:
+    if STRICT_ARCHIVAL and computed_digest8 != _PREREG_DIGEST8:
         raise RuntimeError(
             "STRICT_ARCHIVAL: Window preregistration hash mismatch!\n"
             f"Expected hash16 ({PREREG_DATE}): {PREREG_HASH16}\n"
@@ -195,7 +316,7 @@ def whiten_pinned(ts: Any, asd: Any) -> Any:
     In strict mode:
       - if whitening with pinned kwargs fails via TypeError => RuntimeError (no fallback)
     """
-    global _WHITEN_MODES_SEEN, _WHITEN_FALLBACK_REASON, _WHITEN_FALLBACK_LOGGED
+    global _WHITEN_MODES_MASK, _WHITEN_FALLBACK_REASON, _WHITEN_FALLBACK_LOGGED
 
     try:
         res = ts.whiten(
@@ -204,11 +325,11 @@ def whiten_pinned(ts: Any, asd: Any) -> Any:
             overlap=WHITEN_OVERLAP,
             window=WHITEN_WINDOW,
         )
-        _WHITEN_MODES_SEEN.add("pinned_kwargs")
+        _WHITEN_MODES_MASK |= _MODE_PINNED_KWARGS
         return res
 
     except TypeError as e:
-        _WHITEN_MODES_SEEN.add("asd_only_fallback")
+        _WHITEN_MODES_MASK |= _MODE_ASD_ONLY_FALLBACK
         if _WHITEN_FALLBACK_REASON is None:
             _WHITEN_FALLBACK_REASON = str(e)
 
@@ -222,33 +343,84 @@ def whiten_pinned(ts: Any, asd: Any) -> Any:
         return ts.whiten(asd=asd)
 
 
+class _StubTS:
+    """Stand-in TimeSeries for the whitening self-check (no data fetch)."""
+
+    _REQUIRED_KWARGS = frozenset({"asd", "fftlength", "overlap", "window"})
+
+    def whiten(self, **kwargs):
+        # If kwargs include the pinned ones, accept; else emulate failure.
+        if not self._REQUIRED_KWARGS.issubset(kwargs):
+            raise TypeError("Missing pinned whitening kwargs")
+        return "ok"
+
+
+# Once the self-check has passed it cannot regress within the process
+# (it exercises fixed code, not run state), so later runs skip it.
+# Deliberately NOT cleared by reset_runtime_state().
+_SELFCHECK_PASSED = False
+
+
 def strict_selfcheck_whitening_path() -> None:
     """
     Mechanical proof at runtime that the whitening determinism path is exercised.
     Uses a tiny local stub object so this check does not require data fetch.
+
+    Skipped after the first successful pass in-process; the pinned-mode
+    flag is still recorded so run records stay identical across runs.
     """
-    class _StubTS:
-        def whiten(self, **kwargs):
-            # If kwargs include the pinned ones, accept; else emulate failure.
-            required = {"asd", "fftlength", "overlap", "window"}
-            if not required.issubset(set(kwargs.keys())):
-                raise TypeError("Missing pinned whitening kwargs")
-            return "ok"
+    global _SELFCHECK_PASSED, _WHITEN_MODES_MASK
+
+    if _SELFCHECK_PASSED:
+        _WHITEN_MODES_MASK |= _MODE_PINNED_KWARGS
+        return
 
     whiten_pinned(_StubTS(), asd=object())
+    _SELFCHECK_PASSED = True
 
 
 # ------------------------------------------------------------------
 # FORENSIC ARTIFACTS
 # ------------------------------------------------------------------
 
+# Prebuilt encoder: json.dumps() re-resolves its keyword options and
+# constructs a throwaway encoder on every call; binding one here keeps
+# the hot path on the C encoder directly. We deliberately stay on the
+# stdlib encoder (not orjson): ensure_ascii escaping is part of the
+# byte-for-byte artifact contract and orjson is not in the pinned set.
+_JSON_ENCODER = json.JSONEncoder(
+    sort_keys=True,
+    separators=(",", ":"),
+    ensure_ascii=True,
+)
+
+
 def _dump_json_bytes(obj: Dict[str, Any]) -> bytes:
-    return json.dumps(
-        obj,
-        sort_keys=True,
-        separators=(",", ":"),
-        ensure_ascii=True,
-    ).encode("utf-8")
+    return _JSON_ENCODER.encode(obj).encode("utf-8")
+
+
+# Canonical environment sub-dict, built once per process: every field
+# is process-invariant, so stable and audit records can share it (the
+# audit record layers platform_detail on via a shallow merge, never by
+# mutating this dict).
+_ENV_STABLE = None
+
+
+def _stable_environment() -> Dict[str, Any]:
+    global _ENV_STABLE
+    if _ENV_STABLE is None:
+        scipy_ver, gwpy_ver = _load_heavy_versions()
+        _ENV_STABLE = {
+            # deterministic enough for same environment; avoid platform.platform() here
+            "python": _PY_ACTUAL_FULL,
+            "os": _OS_NAME,
+            "arch": _ARCH,
+            "numpy": np.__version__,
+            "scipy": scipy_ver,
+            "gwpy": gwpy_ver,
+            "lal": _load_lal_version(),
+        }
+    return _ENV_STABLE
 
 
 def write_run_record(
@@ -269,21 +441,13 @@ def write_run_record(
     record_stable = {
         "run_fingerprint_short": fingerprint_short,
         "run_fingerprint_sha256": full_hash,
-        "code_sha256": CODE_SHA256,
+        "code_hash": CODE_HASH,
+        "code_hash_algorithm": CODE_HASH_ALGORITHM,
         "code_source_mode": CODE_SOURCE_MODE,
-        "environment": {
-            # deterministic enough for same environment; avoid platform.platform() here
-            "python": f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
-            "os": sys.platform,
-            "arch": platform.machine(),
-            "numpy": np.__version__,
-            "scipy": scipy.__version__,
-            "gwpy": gwpy.__version__,
-            "lal": (getattr(lal, "__version__", None) if lal is not None else None),
-        },
+        "environment": _stable_environment(),
         "execution_flags": {
             "strict_archival": STRICT_ARCHIVAL,
-            "whitening_modes_seen": sorted(list(_WHITEN_MODES_SEEN)),
+            "whitening_modes_seen": _whiten_modes_list(),
             "whiten_fallback_reason": _WHITEN_FALLBACK_REASON,
         },
         "preregistration": {
@@ -297,21 +461,48 @@ def write_run_record(
         "configuration": config,
     }
 
-    record_unique = dict(record_stable)
-    record_unique["utc_timestamp"] = datetime.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
-    # non-deterministic platform detail goes ONLY in audit record
-    record_unique["environment"] = dict(record_unique["environment"])
-    record_unique["environment"]["platform_detail"] = platform.platform()
+    stable_bytes = _dump_json_bytes(record_stable)
+
+    # Single clock read: both audit timestamps derive from one gmtime()
+    # (second granularity, so no microsecond truncation needed).
+    now_utc = time.gmtime()
+
+    # Audit record = stable record + timestamp + non-deterministic
+    # platform detail, patched in via shallow merges (no deep copies).
+    record_unique = {
+        **record_stable,
+        "utc_timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", now_utc),
+        "environment": {
+            **record_stable["environment"],
+            "platform_detail": platform.platform(),
+        },
+    }
 
-    ts_str = datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    ts_str = time.strftime("%Y%m%dT%H%M%SZ", now_utc)
     unique_fname = f"run_record_{fingerprint_short}_{ts_str}.json"
     stable_fname = "run_record_LATEST.json"
 
     with open(unique_fname, "wb") as f:
         f.write(_dump_json_bytes(record_unique))
 
-    with open(stable_fname, "wb") as f:
-        f.write(_dump_json_bytes(record_stable))
+    # Atomic, durable publish: readers of LATEST must never observe a
+    # torn or truncated artifact, even across a crash. Write a
+    # PID-unique sibling temp file (concurrent writers cannot
+    # interleave), fsync its contents before the rename so the rename
+    # can never expose an empty/partial file, then fsync the directory
+    # so the rename itself is persisted.
+    tmp_fname = f"{stable_fname}.{os.getpid()}.tmp"
+    with open(tmp_fname, "wb") as f:
+        f.write(stable_bytes)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_fname, stable_fname)
+    if hasattr(os, "O_DIRECTORY"):  # POSIX; not supported on Windows
+        dir_fd = os.open(os.path.dirname(os.path.abspath(stable_fname)), os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
 
     print(f"[ARCHIVAL] Run Record (Audit): {unique_fname}")
     print(f"[ARCHIVAL] Stable Artifact: {stable_fname}")
@@ -15,68 +15,90 @@ import importlib.util
 from unittest.mock import MagicMock
 import pytest
 
+PIPELINE_PATH = os.path.join(
+    os.path.dirname(__file__), os.pardir, "ligo_residual_analysis_v1_2_7.py"
+)
 
-def load_pipeline(path="ligo_residual_analysis_v1_2_6.py"):
-    spec = importlib.util.spec_from_file_location("pipeline", path)
+
+@pytest.fixture(scope="session")
+def pipeline():
+    """Load the pipeline module once for the whole session.
+
+    Per-test state is reset by the autouse fixture below, so repeated
+    exec_module() calls (and their import cost) are unnecessary.
+    """
+    spec = importlib.util.spec_from_file_location("pipeline", PIPELINE_PATH)
     module = importlib.util.module_from_spec(spec)
     sys.modules["pipeline"] = module
     spec.loader.exec_module(module)
     return module
 
 
-pipeline = load_pipeline()
-
-
 class TestPlatinumIridiumControls:
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def _reset_state(self, pipeline):
         # reset mutable globals
         pipeline.STRICT_ARCHIVAL = True
-        pipeline._WHITEN_MODES_SEEN = set()
+        pipeline._WHITEN_MODES_MASK = 0
         pipeline._WHITEN_FALLBACK_REASON = None
         pipeline._WHITEN_FALLBACK_LOGGED = False
+        pipeline._DEPS_VERIFIED_KEY = None
 
         # avoid environment dependence for most tests:
         pipeline.CODE_SOURCE_MODE = "file"
-        pipeline.CODE_SHA256 = "test_sha"
+        pipeline.CODE_HASH = "test_hash"
 
-    def test_01_import_is_safe(self):
+    def test_01_import_is_safe(self, pipeline):
         # passes if module import didn't raise
         assert pipeline is not None
 
-    def test_02_strict_mode_refuses_version_mismatch(self):
+    def test_02_strict_mode_refuses_version_mismatch(self, pipeline):
+        orig = dict(pipeline.PINNED_VERSIONS)
+        try:
+            pipeline.PINNED_VERSIONS["gwpy"] = "999.0.0"
+            with pytest.raises(RuntimeError, match="Dependency version mismatch"):
+                pipeline.enforce_dependency_versions()
+        finally:
+            pipeline.PINNED_VERSIONS = orig
+
+    def test_02b_version_cache_busts_on_pin_change(self, pipeline):
         orig = dict(pipeline.PINNED_VERSIONS)
         try:
+            # simulate a cached successful check for the current pins
+            pipeline._DEPS_VERIFIED_KEY = pipeline._deps_cache_key()
+            # mutating the pins must invalidate the cache and still fail
             pipeline.PINNED_VERSIONS["gwpy"] = "999.0.0"
             with pytest.raises(RuntimeError, match="Dependency version mismatch"):
                 pipeline.enforce_dependency_versions()
         finally:
             pipeline.PINNED_VERSIONS = orig
+            pipeline._DEPS_VERIFIED_KEY = None
 
-    def test_03_strict_mode_refuses_whitening_fallback(self):
+    def test_03_strict_mode_refuses_whitening_fallback(self, pipeline):
         mock_ts = MagicMock()
         mock_ts.whiten.side_effect = TypeError("Bad kwarg")
         with pytest.raises(RuntimeError, match="Whitening fallback not allowed"):
             pipeline.whiten_pinned(mock_ts, MagicMock())
 
-    def test_04_sorted_whitening_modes(self):
+    def test_04_sorted_whitening_modes(self, pipeline):
         mock_ts = MagicMock()
         mock_ts.whiten.return_value = "ok"
         pipeline.whiten_pinned(mock_ts, MagicMock())
-        assert sorted(list(pipeline._WHITEN_MODES_SEEN)) == ["pinned_kwargs"]
+        assert pipeline._whiten_modes_list() == ["pinned_kwargs"]
 
-    def test_05_file_based_execution_enforced(self):
+    def test_05_file_based_execution_enforced(self, pipeline):
         pipeline.CODE_SOURCE_MODE = "interactive"
         with pytest.raises(RuntimeError, match="file-based execution"):
             pipeline.enforce_file_based_execution()
 
-    def test_06_preregistration_verified_in_strict(self):
+    def test_06_preregistration_verified_in_strict(self, pipeline):
         # Should match baked commitment
         h = pipeline.verify_window_preregistration()
         assert h == pipeline.PREREG_HASH16
 
-    def test_07_stable_artifact_has_no_timestamp(self, tmp_path, monkeypatch):
+    def test_07_stable_artifact_has_no_timestamp(self, pipeline, tmp_path, monkeypatch):
         monkeypatch.chdir(tmp_path)
-        pipeline._WHITEN_MODES_SEEN = set()
+        pipeline._WHITEN_MODES_MASK = 0
 
         pipeline.write_run_record("fp", "hash", {"a": 1}, {"r": 2}, {}, {"seed": 1})
 
@@ -85,15 +107,15 @@ class TestPlatinumIridiumControls:
         assert "utc_timestamp" not in data
         assert data["execution_flags"]["whitening_modes_seen"] == []
 
-    def test_08_latest_is_bit_identical_across_runs(self, tmp_path, monkeypatch):
+    def test_08_latest_is_bit_identical_across_runs(self, pipeline, tmp_path, monkeypatch):
         monkeypatch.chdir(tmp_path)
 
-        pipeline._WHITEN_MODES_SEEN = {"pinned_kwargs"}
+        pipeline._WHITEN_MODES_MASK = pipeline._MODE_PINNED_KWARGS
         pipeline.write_run_record("fp", "hash", {"a": 1}, {"r": 2}, {}, {"seed": 1})
         b1 = (tmp_path / "run_record_LATEST.json").read_bytes()
 
         # second run (audit timestamp changes, stable must not)
-        pipeline._WHITEN_MODES_SEEN = {"pinned_kwargs"}
+        pipeline._WHITEN_MODES_MASK = pipeline._MODE_PINNED_KWARGS
         pipeline.write_run_record("fp", "hash", {"a": 1}, {"r": 2}, {}, {"seed": 1})
         b2 = (tmp_path / "run_record_LATEST.json").read_bytes()
 